@@ -1,18 +1,102 @@
+import re
+import time
 from datetime import datetime, timezone
-from typing import Annotated, List
+from typing import Annotated, List, Optional
 
+import orjson
+from cachetools import TTLCache
 from fastapi import APIRouter, Depends, HTTPException, status, Query
-from fastapi.responses import RedirectResponse
+from fastapi.responses import Response, StreamingResponse
 from redis.asyncio import Redis
+from sqlalchemy import Row
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.models.urls import URL
 from app.schemas.urls import URLCreate, URLResponse, URLUpdate, URLFilterParams
-from app.services import db, redis
+from app.services import db, redis, url_loader
 from app.utils.shortcode_generator import generate_shortcode
 
 router = APIRouter(prefix="/urls")
 
+# Cached URL entries get their own prefix so client-side caching tracks only them,
+# not the url:miss:* negative cache or the url:counter shortcode counter
+CACHE_KEY_PREFIX = "url:c:"
+
+# Safety-net TTL for cached URLs, so entries never live in Redis forever
+CACHE_TTL_SECONDS = 24 * 60 * 60
+# Short TTL for negative-cache entries of unknown/inactive short codes
+MISS_TTL_SECONDS = 30
+# Fresh short codes tried per shorten before giving up on collisions
+SHORTCODE_ATTEMPTS = 5
+# Per-process TTL for hot short codes; a safety net behind the invalidation
+# messages Redis pushes, kept well below CACHE_TTL_SECONDS
+L1_TTL_SECONDS = 60
+
+# In-process L1 cache in front of Redis: short_code -> (original_url, expires_at_ts)
+_l1_cache: TTLCache = TTLCache(maxsize=100_000, ttl=L1_TTL_SECONDS)
+
+# Anything else can never match the base62 short_code column (String(10))
+_SHORT_CODE_RE = re.compile(r"[0-9A-Za-z]{1,10}")
+
+# Fields written for each row streamed by /info/
+_URL_RESPONSE_FIELDS = tuple(URLResponse.model_fields)
+
+
+def invalidate_l1_cache(keys: Optional[List[str]]) -> None:
+    """
+    Drop L1 entries for Redis keys that another client modified.
+
+    Args:
+        keys: Invalidated Redis keys, or None to clear the whole L1 cache
+    """
+    if keys is None:
+        _l1_cache.clear()
+        return
+    for key in keys:
+        _l1_cache.pop(key.removeprefix(CACHE_KEY_PREFIX), None)
+
+
+def _redirect(original_url: str) -> Response:
+    """Build a bare 307; stored URLs are already percent-encoded by HttpUrl."""
+    return Response(
+        status_code=status.HTTP_307_TEMPORARY_REDIRECT,
+        headers={"location": original_url},
+    )
+
+
+def _as_utc(value: datetime) -> datetime:
+    """Assume timezone-aware timestamps; treat naive ones as UTC."""
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+async def _cache_url(redis_client: Redis, url_obj: URL | Row) -> None:
+    """
+    Cache an active URL in Redis as a JSON-encoded `[original_url, expires_at_ts]` pair.
+
+    Inactive URLs are removed from the cache instead. The entry expires after
+    CACHE_TTL_SECONDS, or at the URL's own expiry if that comes first, so Redis
+    evicts expired links by itself. Any negative-cache entry for the short code
+    is dropped in the same round-trip.
+    """
+    cache_key = f"{CACHE_KEY_PREFIX}{url_obj.short_code}"
+    ttl_ms = CACHE_TTL_SECONDS * 1000
+    expires_at_ts = None
+
+    if url_obj.expires_at:
+        expires_at = _as_utc(url_obj.expires_at).timestamp()
+        expires_at_ts = int(expires_at)
+        ttl_ms = min(ttl_ms, int((expires_at - time.time()) * 1000))
+
+    async with redis_client.pipeline(transaction=False) as pipe:
+        if url_obj.is_active and ttl_ms > 0:
+            cache_data = orjson.dumps([url_obj.original_url, expires_at_ts])
+            pipe.set(cache_key, cache_data, px=ttl_ms)
+        else:
+            # Already expired - make sure no stale entry is left behind
+            pipe.delete(cache_key)
+        pipe.delete(f"url:miss:{url_obj.short_code}")
+        await pipe.execute()
+
 
 @router.post("/shorten", response_model=URLResponse)
 async def shorten_url(
@@ -25,81 +109,78 @@ async def shorten_url(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Custom short codes are not supported.",
         )
-    
-    shortcode: str = await generate_shortcode(redis_client, "url:counter")
 
-    payload = url.model_dump(exclude_unset=True)
-    payload["original_url"] = str(url.original_url)
-    payload["short_code"] = shortcode
+    payload = {field: getattr(url, field) for field in url.model_fields_set}
+
+    # Counter codes are unique, but a reset or wrapped counter can hand out a
+    # code that is already taken - skip to the next one instead of failing
+    for _ in range(SHORTCODE_ATTEMPTS):
+        payload["short_code"] = await generate_shortcode(redis_client, "url:counter")
+        url_instance = await URL.create_if_absent(db, ("short_code",), **payload)
+        if url_instance is not None:
+            break
+    else:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Could not allocate a short code.",
+        )
+
+    await _cache_url(redis_client, url_instance)
 
-    url_instance: URL = await URL.create(db, **payload)
-    
-    # Cache the URL data in Redis using a hash
-    hash_key = f"url:{shortcode}"
-    cache_data = {
-        "id": str(url_instance.id),
-        "short_code": url_instance.short_code,
-        "original_url": url_instance.original_url,
-        "is_active": str(url_instance.is_active),
-    }
-    
-    # Add expires_at if it exists
-    if url_instance.expires_at:
-        cache_data["expires_at"] = url_instance.expires_at.isoformat()
-    
-    # Store in Redis hash
-    await redis_client.hset(hash_key, mapping=cache_data)
-    
     return url_instance
 
 
 @router.get("/{short_code}")
 async def redirect_to_original(
     short_code: str,
-    db_session: AsyncSession = Depends(db.get_session),
     redis_client: Redis = Depends(redis.get_redis),
-) -> RedirectResponse:
+) -> Response:
     """
     Resolve a shortcode to its original URL and perform an HTTP redirect.
     """
-    # Check cache first
-    hash_key = f"url:{short_code}"
-    cached_data = await redis_client.hgetall(hash_key)
-    
-    if cached_data:
-        # Found in cache
-        is_active = cached_data.get("is_active", "True").lower() == "true"
-        
-        if not is_active:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Short URL not found.",
-            )
-        
-        # Check expiry if set
-        expires_at_str = cached_data.get("expires_at")
-        if expires_at_str:
-            expires_at = datetime.fromisoformat(expires_at_str.replace("Z", "+00:00"))
-            now = datetime.now(timezone.utc)
-            if expires_at <= now:
-                # Remove expired entry from cache
-                await redis_client.delete(hash_key)
-                raise HTTPException(
-                    status_code=status.HTTP_410_GONE,
-                    detail="Short URL has expired.",
-                )
-        
-        original_url = cached_data.get("original_url")
-        if original_url:
-            return RedirectResponse(
-                url=original_url, status_code=status.HTTP_307_TEMPORARY_REDIRECT
-            )
-    
+    # Reject malformed codes (scanners, typos) before any cache or database I/O
+    if _SHORT_CODE_RE.fullmatch(short_code) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Short URL not found.",
+        )
+
+    # Hot short codes are served from the in-process cache without any I/O
+    hit = _l1_cache.get(short_code)
+    if hit is not None:
+        original_url, expires_at_ts = hit
+        if expires_at_ts is None or expires_at_ts > time.time():
+            return _redirect(original_url)
+        # Expired - fall through so the lookup below answers with 410
+        _l1_cache.pop(short_code, None)
+
+    # Check cache and negative cache in a single round-trip
+    cached, is_known_miss = await redis_client.mget(
+        f"{CACHE_KEY_PREFIX}{short_code}", f"url:miss:{short_code}"
+    )
+
+    if cached:
+        # Only active URLs are cached, and the key expires together with the URL
+        original_url, expires_at_ts = orjson.loads(cached)
+        _l1_cache[short_code] = (original_url, expires_at_ts)
+        return _redirect(original_url)
+
+    # Known-bad short code - skip the database round-trip
+    if is_known_miss:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Short URL not found.",
+        )
+
     # Cache miss - query database
-    url_obj = await URL.filter_by(db_session, short_code=short_code, is_active=True)
+    # Concurrent misses are coalesced into a single query
+    url_obj = await url_loader.load_url(short_code)
 
     # Not found or inactive
     if url_obj is None:
+        await redis_client.set(
+            f"url:miss:{short_code}", 1, ex=MISS_TTL_SECONDS, nx=True
+        )
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Short URL not found.",
@@ -107,57 +188,53 @@ async def redirect_to_original(
 
     # Check expiry, if set
     if url_obj.expires_at is not None:
-        # Assume timezone-aware timestamps; fall back safely if naive
         now = datetime.now(timezone.utc)
-        expires_at = (
-            url_obj.expires_at
-            if url_obj.expires_at.tzinfo
-            else url_obj.expires_at.replace(tzinfo=timezone.utc)
-        )
-        if expires_at <= now:
+        if _as_utc(url_obj.expires_at) <= now:
             raise HTTPException(
                 status_code=status.HTTP_410_GONE,
                 detail="Short URL has expired.",
             )
     
-    # Cache the result for future requests
-    hash_key = f"url:{short_code}"
-    cache_data = {
-        "id": str(url_obj.id),
-        "short_code": url_obj.short_code,
-        "original_url": url_obj.original_url,
-        "is_active": str(url_obj.is_active),
-    }
-    
-    if url_obj.expires_at:
-        cache_data["expires_at"] = url_obj.expires_at.isoformat()
-    
-    await redis_client.hset(hash_key, mapping=cache_data)
+    # Cache the result for future requests. L1 is left to the next Redis hit:
+    # this SET sends an invalidation back to our own tracking connection,
+    # which would drop an L1 entry written here straight away.
+    await _cache_url(redis_client, url_obj)
 
-    return RedirectResponse(
-        url=url_obj.original_url, status_code=status.HTTP_307_TEMPORARY_REDIRECT
-    )
+    return _redirect(url_obj.original_url)
 
 
 @router.get("/info/", response_model=List[URLResponse])
 async def get_url_info(
     filter_params: Annotated[URLFilterParams, Query()],
     db_session: AsyncSession = Depends(db.get_session),
-) -> URLResponse:
+) -> StreamingResponse:
     """
     Get URL details by short code.
-    """
-
-    url_obj = await URL.filter_all(db_session, **filter_params.model_dump(exclude_unset=True, exclude_none=True))
 
-    if url_obj is None:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Short URL not found.",
-        )
+    Matching rows are streamed as a JSON array, one database batch at a time.
+    """
+    filters = {
+        field: value
+        for field in filter_params.model_fields_set
+        if (value := getattr(filter_params, field)) is not None
+    }
+    result = await URL.stream_by(db_session, **filters)
 
-    return url_obj
+    async def generate():
+        yield b"["
+        separator = b""
+        async for partition in result.partitions():
+            yield separator + b",".join(
+                orjson.dumps(
+                    {field: getattr(url, field) for field in _URL_RESPONSE_FIELDS},
+                    option=orjson.OPT_UTC_Z,
+                )
+                for url in partition
+            )
+            separator = b","
+        yield b"]"
 
+    return StreamingResponse(generate(), media_type="application/json")
 
 
 @router.put("/{id}", response_model=URLResponse)
@@ -170,39 +247,20 @@ async def update_url(
     """
     Update URL details by id.
     """
-    updates = url_update.model_dump(exclude_unset=True)
-
-    # Convert HttpUrl to string if original_url is being updated
-    if "original_url" in updates:
-        updates["original_url"] = str(updates["original_url"])
+    updates = {field: getattr(url_update, field) for field in url_update.model_fields_set}
 
     # Update the URL
     updated_url = await URL.update(db_session, id, updates)
-    
-    # Update cache
-    hash_key = f"url:{updated_url.short_code}"
-    cache_data = {
-        "id": str(updated_url.id),
-        "short_code": updated_url.short_code,
-        "original_url": updated_url.original_url,
-        "is_active": str(updated_url.is_active),
-    }
-    
-    if updated_url.expires_at:
-        cache_data["expires_at"] = updated_url.expires_at.isoformat()
-    
-    await redis_client.hset(hash_key, mapping=cache_data)
-    
-    # If expired, delete from cache
-    if updated_url.expires_at:
-        expires_at = (
-            updated_url.expires_at
-            if updated_url.expires_at.tzinfo
-            else updated_url.expires_at.replace(tzinfo=timezone.utc)
+
+    if updated_url is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Short URL not found.",
         )
-        now = datetime.now(timezone.utc)
-        if expires_at <= now:
-            await redis_client.delete(hash_key)
+
+    # Refresh the cache; deactivated or already-expired URLs are evicted instead
+    await _cache_url(redis_client, updated_url)
+    _l1_cache.pop(updated_url.short_code, None)
 
     return updated_url
 
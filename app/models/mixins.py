@@ -1,10 +1,84 @@
-from typing import Optional, Any, Dict, List, Type, TypeVar
-from sqlalchemy import Column, DateTime, select
-from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.sql import func
+from functools import cache, lru_cache
+from typing import (
+    Optional,
+    Any,
+    AsyncIterator,
+    ClassVar,
+    Dict,
+    FrozenSet,
+    List,
+    Sequence,
+    Tuple,
+    Type,
+    TypeVar,
+)
+from sqlalchemy import (
+    ARRAY,
+    Column,
+    DateTime,
+    Select,
+    any_,
+    bindparam,
+    insert,
+    select,
+)
+from sqlalchemy import delete as sa_delete, exists as sql_exists, update as sa_update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncScalarResult, AsyncSession
+from sqlalchemy.orm import raiseload
+from sqlalchemy.orm.interfaces import ORMOption
+from sqlalchemy.sql import ColumnElement, func
 
 T = TypeVar("T", bound="CRUDMixin")
 
+# bulk_create switches from INSERT to COPY at this many rows (asyncpg only)
+BULK_COPY_THRESHOLD = 100
+
+# Filter shape: sorted (field name, value is None) pairs
+FilterKey = Tuple[Tuple[str, bool], ...]
+
+
+def _filter_key(filters: Dict[str, Any]) -> Tuple[FilterKey, Dict[str, Any]]:
+    """
+    Split equality filters into a hashable shape and the bind parameter values.
+
+    None values are part of the shape because they compile to IS NULL rather
+    than a bound comparison.
+    """
+    key = tuple(sorted((name, value is None) for name, value in filters.items()))
+    params = {name: value for name, value in filters.items() if value is not None}
+    return key, params
+
+
+@lru_cache(maxsize=256)
+def _filter_criteria(cls: type, key: FilterKey) -> Tuple[ColumnElement, ...]:
+    """Build the WHERE criteria for a filter shape, binding one parameter per field."""
+    return tuple(
+        getattr(cls, name).is_(None)
+        if is_none
+        else getattr(cls, name) == bindparam(name)
+        for name, is_none in key
+    )
+
+
+@lru_cache(maxsize=256)
+def _select_stmt(cls: type, key: FilterKey, first: bool = False) -> Select:
+    """Build the SELECT statement for a filter shape once and reuse it."""
+    stmt = select(cls).options(*cls._loader_options).where(*_filter_criteria(cls, key))
+    return stmt.limit(1) if first else stmt
+
+
+@lru_cache(maxsize=256)
+def _count_stmt(cls: type, key: FilterKey) -> Select:
+    """Build the COUNT statement for a filter shape once and reuse it."""
+    return select(func.count()).select_from(cls).where(*_filter_criteria(cls, key))
+
+
+@lru_cache(maxsize=256)
+def _exists_stmt(cls: type, key: FilterKey) -> Select:
+    """Build the EXISTS statement for a filter shape once and reuse it."""
+    return select(sql_exists().select_from(cls).where(*_filter_criteria(cls, key)))
+
 
 class TimestampMixin:
     """
@@ -16,9 +90,13 @@ class TimestampMixin:
     """
 
     created_at = Column(DateTime(timezone=True),
-                        default=func.now(), nullable=False)
+                        default=func.now(), server_default=func.now(), nullable=False)
     updated_at = Column(
-        DateTime(timezone=True), default=func.now(), onupdate=func.now(), nullable=False
+        DateTime(timezone=True),
+        default=func.now(),
+        server_default=func.now(),
+        onupdate=func.now(),
+        nullable=False,
     )
 
 
@@ -47,6 +125,12 @@ class CRUDMixin:
             user = await User.get_by_id(session, 1)
     """
 
+    # Loader options applied to every SELECT the mixin issues. raiseload("*") makes
+    # any relationship access that would lazy-load (N+1, MissingGreenlet under
+    # asyncio) fail fast; models opt into eager loads by overriding this, e.g.
+    # `_loader_options = (selectinload(User.posts), raiseload("*"))`
+    _loader_options: ClassVar[Tuple[ORMOption, ...]] = (raiseload("*"),)
+
     @classmethod
     async def create(
         cls: Type[T], session: AsyncSession, commit: bool = True, **kwargs
@@ -69,13 +153,53 @@ class CRUDMixin:
             async with async_session() as session:
                 user = await User.create(session, name="Jane", email="jane@example.com")
         """
-        instance = cls(**kwargs)
-        session.add(instance)
+        # INSERT ... RETURNING hands back the full row as a persistent instance,
+        # so the create costs a single round trip and never needs a refresh
+        stmt = insert(cls).values(**kwargs).returning(cls)
+        result = await session.scalars(stmt)
+        instance = result.one()
+        if commit:
+            await session.commit()
+        return instance
+
+    @classmethod
+    async def create_if_absent(
+        cls: Type[T],
+        session: AsyncSession,
+        conflict_columns: Sequence[str],
+        commit: bool = True,
+        **kwargs,
+    ) -> Optional[T]:
+        """
+        Create a new instance unless it would violate a unique index (PostgreSQL).
+
+        Runs a single atomic `INSERT ... ON CONFLICT DO NOTHING RETURNING`, so
+        there is no check-then-insert race and no extra round trip.
+
+        Args:
+            session: SQLAlchemy async database session
+            conflict_columns: Columns of the unique index to check for conflicts
+            commit: Whether to commit the transaction immediately (default: True)
+            **kwargs: Field values for the new instance
+
+        Returns:
+            The newly created instance, or None if a conflicting row already exists
+
+        Example:
+            async with async_session() as session:
+                user = await User.create_if_absent(
+                    session, ("email",), name="Jane", email="jane@example.com"
+                )
+        """
+        stmt = (
+            pg_insert(cls)
+            .values(**kwargs)
+            .on_conflict_do_nothing(index_elements=list(conflict_columns))
+            .returning(cls)
+        )
+        instance = (await session.scalars(stmt)).one_or_none()
         if commit:
             await session.commit()
-            await session.refresh(instance)
-        else:
-            await session.flush()
         return instance
 
     @classmethod
@@ -94,7 +218,7 @@ class CRUDMixin:
             async with async_session() as session:
                 user = await User.get_by_id(session, 42)
         """
-        return await session.get(cls, id)
+        return await session.get(cls, id, options=cls._loader_options)
 
     @classmethod
     async def get_or_404(cls: Type[T], session: AsyncSession, id: Any) -> T:
@@ -136,9 +260,9 @@ class CRUDMixin:
             async with async_session() as session:
                 user = await User.filter_by(session, email="user@example.com")
         """
-        stmt = select(cls).filter_by(**kwargs)
-        result = await session.execute(stmt)
-        return result.scalar_one_or_none()
+        key, params = _filter_key(kwargs)
+        result = await session.scalars(_select_stmt(cls, key, first=True), params)
+        return result.first()
 
     @classmethod
     async def filter_all(cls: Type[T], session: AsyncSession, **kwargs) -> List[T]:
@@ -156,9 +280,38 @@ class CRUDMixin:
             async with async_session() as session:
                 active_users = await User.filter_all(session, is_active=True)
         """
-        stmt = select(cls).filter_by(**kwargs)
-        result = await session.execute(stmt)
-        return list(result.scalars().all())
+        key, params = _filter_key(kwargs)
+        result = await session.scalars(_select_stmt(cls, key), params)
+        return list(result.all())
+
+    @classmethod
+    async def stream_by(
+        cls: Type[T], session: AsyncSession, yield_per: int = 1000, **kwargs
+    ) -> AsyncScalarResult[T]:
+        """
+        Stream all records matching the given filters.
+
+        Rows are fetched from a server-side cursor `yield_per` at a time, so
+        large result sets are never loaded into memory at once.
+
+        Args:
+            session: SQLAlchemy async database session
+            yield_per: Number of rows fetched per round trip (default: 1000)
+            **kwargs: Field names and values to filter by
+
+        Returns:
+            Async result of matching model instances; iterate it directly or
+            batch-wise through `.partitions()`
+
+        Example:
+            async with async_session() as session:
+                result = await User.stream_by(session, is_active=True)
+                async for user in result:
+                    ...
+        """
+        key, params = _filter_key(kwargs)
+        stmt = _select_stmt(cls, key).execution_options(yield_per=yield_per)
+        return await session.stream_scalars(stmt, params)
 
     @classmethod
     async def get_all(
@@ -178,11 +331,50 @@ class CRUDMixin:
             async with async_session() as session:
                 all_users = await User.get_all(session, limit=100)
         """
-        stmt = select(cls)
+        stmt = select(cls).options(*cls._loader_options)
+        if limit:
+            stmt = stmt.limit(limit)
+        result = await session.scalars(stmt)
+        return list(result.all())
+
+    @classmethod
+    async def iter_all(
+        cls: Type[T],
+        session: AsyncSession,
+        limit: Optional[int] = None,
+        yield_per: int = 1000,
+    ) -> AsyncIterator[T]:
+        """
+        Iterate over all records of this model without loading them all at once.
+
+        Rows are fetched from a server-side cursor `yield_per` at a time, so the
+        first record is available before the rest have been read.
+
+        Args:
+            session: SQLAlchemy async database session
+            limit: Maximum number of records to return (optional)
+            yield_per: Number of rows fetched per round trip (default: 1000)
+
+        Yields:
+            Model instances, one at a time
+
+        Example:
+            async with async_session() as session:
+                async for user in User.iter_all(session):
+                    ...
+        """
+        stmt = select(cls).options(*cls._loader_options)
         if limit:
             stmt = stmt.limit(limit)
-        result = await session.execute(stmt)
-        return list(result.scalars().all())
+        result = await session.stream_scalars(
+            stmt.execution_options(yield_per=yield_per)
+        )
+        try:
+            async for instance in result:
+                yield instance
+        finally:
+            # Release the server-side cursor even if the caller stops early
+            await result.close()
 
     @classmethod
     async def update(
@@ -208,16 +400,24 @@ class CRUDMixin:
             async with async_session() as session:
                 user = await User.update(session, 1, {"name": "John Smith", "age": 30})
         """
-        instance = await cls.get_by_id(session, id)
-        if instance:
-            for key, value in updates.items():
-                if hasattr(instance, key):
-                    setattr(instance, key, value)
-            if commit:
-                await session.commit()
-                await session.refresh(instance)
-            else:
-                await session.flush()
+        values = {
+            key: value for key, value in updates.items() if key in cls._column_keys()
+        }
+        if not values:
+            return await cls.get_by_id(session, id)
+
+        # UPDATE ... RETURNING applies the change and reloads the row (including
+        # onupdate columns) in one round trip instead of SELECT + UPDATE + SELECT
+        stmt = (
+            sa_update(cls)
+            .where(cls.id == id)
+            .values(**values)
+            .returning(cls)
+            .execution_options(populate_existing=True)
+        )
+        instance = (await session.scalars(stmt)).one_or_none()
+        if commit:
+            await session.commit()
         return instance
 
     async def save(self, session: AsyncSession, commit: bool = True) -> "CRUDMixin":
@@ -270,6 +470,10 @@ class CRUDMixin:
         """
         Create multiple records efficiently.
 
+        Rows are inserted with a single INSERT ... RETURNING. Batches of
+        BULK_COPY_THRESHOLD rows or more are written with `bulk_copy` instead on
+        asyncpg when they include a unique column to load the rows back by.
+
         Args:
             session: SQLAlchemy async database session
             items: List of dictionaries containing field values
@@ -285,16 +489,102 @@ class CRUDMixin:
                     {"name": "Bob", "email": "bob@example.com"}
                 ])
         """
-        instances = [cls(**item) for item in items]
-        session.add_all(instances)
+        if len(items) >= BULK_COPY_THRESHOLD:
+            key = cls._copy_lookup_key(items[0].keys())
+            connection = await session.connection()
+            if key is not None and connection.dialect.driver == "asyncpg":
+                await cls.bulk_copy(session, items, commit=False)
+                # Load the copied rows back in one round trip, in input order;
+                # a single array parameter avoids asyncpg's 32767-parameter cap
+                column = cls.__table__.c[key]
+                values = [item[key] for item in items]
+                stmt = select(cls).options(*cls._loader_options).where(
+                    column == any_(bindparam("keys", values, type_=ARRAY(column.type)))
+                )
+                by_key = {
+                    getattr(instance, key): instance
+                    for instance in await session.scalars(stmt)
+                }
+                if commit:
+                    await session.commit()
+                return [by_key[value] for value in values]
+
+        if not items:
+            return []
+
+        # A single INSERT ... RETURNING (batched via insertmanyvalues) hands back
+        # fully loaded instances in input order, without a refresh per row
+        stmt = insert(cls).returning(cls, sort_by_parameter_order=True)
+        instances = list((await session.scalars(stmt, items)).all())
         if commit:
             await session.commit()
-            for instance in instances:
-                await session.refresh(instance)
-        else:
-            await session.flush()
         return instances
 
+    @classmethod
+    async def bulk_copy(
+        cls: Type[T],
+        session: AsyncSession,
+        rows: List[Dict[str, Any]],
+        columns: Optional[Sequence[str]] = None,
+        commit: bool = True,
+    ) -> int:
+        """
+        Insert many records with PostgreSQL's binary COPY protocol (asyncpg only).
+
+        Much faster than INSERT for large batches, but Python-side column defaults
+        are not applied: omitted columns take their server defaults.
+
+        Args:
+            session: SQLAlchemy async database session
+            rows: List of dictionaries containing field values
+            columns: Columns to copy (default: keys of the first row)
+            commit: Whether to commit the transaction immediately (default: True)
+
+        Returns:
+            Number of records copied
+
+        Example:
+            async with async_session() as session:
+                await User.bulk_copy(session, [
+                    {"name": "Alice", "email": "alice@example.com"},
+                    {"name": "Bob", "email": "bob@example.com"}
+                ])
+        """
+        if not rows:
+            return 0
+        columns = list(columns or rows[0].keys())
+        connection = await session.connection()
+        # SQLAlchemy's asyncpg adapter only sends BEGIN on the first statement it
+        # executes; without one, asyncpg would autocommit the COPY below and
+        # ignore commit=False and rollbacks
+        await connection.exec_driver_sql("SELECT 1")
+        raw_connection = await connection.get_raw_connection()
+        await raw_connection.driver_connection.copy_records_to_table(
+            cls.__tablename__,
+            records=[tuple(row[column] for column in columns) for row in rows],
+            columns=columns,
+        )
+        if commit:
+            await session.commit()
+        return len(rows)
+
+    @classmethod
+    @cache
+    def _column_keys(cls) -> FrozenSet[str]:
+        """Return the mapped column names of this model."""
+        return frozenset(cls.__table__.columns.keys())
+
+    @classmethod
+    def _copy_lookup_key(cls, columns: Any) -> Optional[str]:
+        """Return a unique column among `columns` to load copied rows back by."""
+        table = cls.__table__
+        unique_keys = [column.key for column in table.columns if column.unique] + [
+            index.columns[0].key
+            for index in table.indexes
+            if index.unique and len(index.columns) == 1
+        ]
+        return next((key for key in unique_keys if key in columns), None)
+
     @classmethod
     async def count(cls: Type[T], session: AsyncSession, **kwargs) -> int:
         """
@@ -311,10 +601,8 @@ class CRUDMixin:
             async with async_session() as session:
                 count = await User.count(session, is_active=True)
         """
-        from sqlalchemy import func as sql_func
-
-        stmt = select(sql_func.count()).select_from(cls).filter_by(**kwargs)
-        result = await session.execute(stmt)
+        key, params = _filter_key(kwargs)
+        result = await session.execute(_count_stmt(cls, key), params)
         return result.scalar_one()
 
     @classmethod
@@ -333,13 +621,8 @@ class CRUDMixin:
             async with async_session() as session:
                 exists = await User.exists(session, email="user@example.com")
         """
-        from sqlalchemy import exists as sql_exists
-
-        stmt = select(
-            sql_exists().where(
-                *[getattr(cls, k) == v for k, v in kwargs.items()])
-        )
-        result = await session.execute(stmt)
+        key, params = _filter_key(kwargs)
+        result = await session.execute(_exists_stmt(cls, key), params)
         return result.scalar()
 
     @classmethod
@@ -361,8 +644,9 @@ class CRUDMixin:
             async with async_session() as session:
                 deleted = await User.delete_by_id(session, 42)
         """
-        instance = await cls.get_by_id(session, id)
-        if instance:
-            await instance.delete(session, commit=commit)
-            return True
-        return False
+        # DELETE ... RETURNING reports whether a row matched in the same round trip
+        stmt = sa_delete(cls).where(cls.id == id).returning(cls.id)
+        deleted = (await session.execute(stmt)).scalar() is not None
+        if commit:
+            await session.commit()
+        return deleted
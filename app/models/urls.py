@@ -6,6 +6,7 @@ from sqlalchemy import (
     Boolean,
     DateTime,
     Index,
+    true,
 )
 
 from app.services.db import Base
@@ -16,10 +17,20 @@ class URL(Base, TimestampMixin, CRUDMixin):
     __tablename__ = "urls"
 
     id = Column(BigInteger, primary_key=True, autoincrement=True)
-    short_code = Column(String(10), unique=True, nullable=False, index=True)
+    short_code = Column(String(10), nullable=False)
     original_url = Column(Text, nullable=False)
     expires_at = Column(DateTime, nullable=True)
-    is_active = Column(Boolean, default=True, nullable=False, index=True)
+    is_active = Column(
+        Boolean, default=True, server_default=true(), nullable=False, index=True
+    )
 
-    # Composite indexes
-    __table_args__ = (Index("idx_active_urls", "is_active", "short_code"),)
+    __table_args__ = (
+        # Enforces short_code uniqueness and covers the redirect lookup, so
+        # short codes resolve via index-only scans
+        Index(
+            "idx_urls_shortcode_include",
+            "short_code",
+            unique=True,
+            postgresql_include=["original_url", "expires_at", "is_active"],
+        ),
+    )
@@ -1,12 +1,28 @@
 from datetime import datetime
-from typing import Optional
+from typing import Annotated, Optional
 
-from pydantic import BaseModel, Field, HttpUrl
+from pydantic import AfterValidator, BaseModel, ConfigDict, Field, HttpUrl
+
+# Longest normalised URL accepted, in bytes. The URL is stored in the
+# idx_urls_shortcode_include INCLUDE list, and Postgres rejects btree index
+# rows over ~2704 bytes; percent-encoding can grow a URL well past the 2083
+# characters HttpUrl checks on the raw input.
+MAX_URL_BYTES = 2000
+
+
+def _check_url_size(url: str) -> str:
+    if len(url.encode()) > MAX_URL_BYTES:
+        raise ValueError(f"URL must be at most {MAX_URL_BYTES} bytes once normalised")
+    return url
+
+
+# Validated as an HTTP URL once, then kept as its normalised string
+HttpUrlStr = Annotated[HttpUrl, AfterValidator(str), AfterValidator(_check_url_size)]
 
 
 class URLBase(BaseModel):
     short_code: Optional[str] = Field(None, max_length=10)
-    original_url: HttpUrl  # Validates URL format
+    original_url: HttpUrlStr  # Validates URL format
     expires_at: Optional[datetime] = None
     is_active: bool = True
 
@@ -20,7 +36,7 @@ class URLCreate(URLBase):
 class URLUpdate(BaseModel):
     """Input for updating URL"""
 
-    original_url: Optional[HttpUrl] = None
+    original_url: Optional[HttpUrlStr] = None
     expires_at: Optional[datetime] = None
     is_active: Optional[bool] = None
 
@@ -30,17 +46,18 @@ class URLResponse(URLBase):
 
     id: int
     short_code: str  # Generated, required in response
+    original_url: str  # Validated on the way in; stored normalised
     created_at: datetime
     updated_at: datetime
 
-    class Config:
-        from_attributes = True 
+    model_config = ConfigDict(from_attributes=True)
+
 
 class URLRedirectResponse(BaseModel):
     """Minimal response for redirect endpoint"""
 
     short_code: str
-    original_url: HttpUrl
+    original_url: str  # Read back from the database, validated on insert
 
 
 class URLFilterParams(BaseModel):
@@ -1,10 +1,14 @@
+import asyncio
 import os
-from typing import Optional
+from typing import Callable, List, Optional
 
 import redis.asyncio as redis
+from loguru import logger
 
 redis_client: Optional[redis.Redis] = None
 
+INVALIDATION_CHANNEL = "__redis__:invalidate"
+
 
 async def init_redis() -> None:
     """
@@ -23,6 +27,10 @@ async def init_redis() -> None:
         port=int(os.getenv("REDIS_PORT")),
         db=int(os.getenv("REDIS_DB")),
         decode_responses=True,
+        # Keep idle pooled sockets alive and PING ones idle for 30s before reuse,
+        # so a dropped connection is replaced instead of failing a request
+        socket_keepalive=True,
+        health_check_interval=30,
     )
 
 
@@ -39,3 +47,56 @@ async def get_redis() -> redis.Redis:
     if redis_client is None:
         raise RuntimeError("Redis client not initialized")
     return redis_client
+
+
+async def track_invalidations(
+    prefix: str, on_invalidate: Callable[[Optional[List[str]]], None]
+) -> None:
+    """
+    Listen for server-assisted client-side caching invalidations.
+
+    Opens a dedicated connection, enables CLIENT TRACKING in broadcasting mode
+    for keys starting with `prefix` and redirects the invalidation messages to
+    that same connection. `on_invalidate` is called with the invalidated keys
+    whenever any client modifies one of them, or with None when the server
+    flushed its keyspace or the connection dropped and messages may have been
+    missed. Runs until cancelled, reconnecting on connection errors.
+
+    Args:
+        prefix: Key prefix to track, e.g. "url:c:"
+        on_invalidate: Callback receiving the invalidated keys, or None for all
+
+    Raises:
+        RuntimeError: If the Redis client has not been initialized.
+    """
+    if redis_client is None:
+        raise RuntimeError("Redis client not initialized")
+
+    while True:
+        connection = redis_client.connection_pool.make_connection()
+        try:
+            await connection.connect()
+            await connection.send_command("CLIENT", "ID")
+            client_id = await connection.read_response()
+            await connection.send_command(
+                "CLIENT", "TRACKING", "ON", "REDIRECT", client_id,
+                "BCAST", "PREFIX", prefix,
+            )
+            await connection.read_response()
+            await connection.send_command("SUBSCRIBE", INVALIDATION_CHANNEL)
+            await connection.read_response()
+
+            while True:
+                # ["message", "__redis__:invalidate", [keys] | None]
+                kind, _, keys = await connection.read_response()
+                if kind == "message":
+                    on_invalidate(keys)
+        except redis.ResponseError as exc:
+            logger.error(f"Redis client-side caching unavailable: {exc}")
+            return
+        except (redis.ConnectionError, redis.TimeoutError) as exc:
+            logger.warning(f"Lost Redis invalidation connection: {exc}")
+            on_invalidate(None)
+            await asyncio.sleep(1)
+        finally:
+            await connection.disconnect()
@@ -0,0 +1,95 @@
+import asyncio
+from typing import Dict, Optional, Set
+
+from sqlalchemy import ARRAY, Row, any_, bindparam, select
+
+from app.models.urls import URL
+from app.services import db
+
+# How long a lookup waits for concurrent lookups to join its batch
+BATCH_WINDOW_SECONDS = 0.001
+
+# A batch is sent right away once it holds this many short codes
+MAX_BATCH_SIZE = 500
+
+# Active URLs for a batch of short codes, answered from the covering index
+_lookup_stmt = select(
+    URL.short_code, URL.original_url, URL.expires_at, URL.is_active
+).where(
+    URL.short_code
+    == any_(bindparam("short_codes", type_=ARRAY(URL.__table__.c.short_code.type))),
+    URL.is_active,
+)
+
+_pending: Dict[str, asyncio.Future] = {}
+_flush_handle: Optional[asyncio.TimerHandle] = None
+_flush_tasks: Set[asyncio.Task] = set()
+
+
+async def load_url(short_code: str) -> Optional[Row]:
+    """
+    Look up an active URL by short code, coalescing concurrent lookups.
+
+    Lookups arriving within BATCH_WINDOW_SECONDS of each other share a single
+    `WHERE short_code = ANY(...)` query on their own session, so a burst of
+    cache misses costs one database round trip instead of one each. Concurrent
+    lookups of the same short code share one result.
+
+    Args:
+        short_code (str): The short code to resolve.
+
+    Returns:
+        Optional[Row]: Row with short_code, original_url, expires_at and
+        is_active, or None if no active URL has this short code.
+    """
+    global _flush_handle
+    future = _pending.get(short_code)
+    if future is None:
+        loop = asyncio.get_running_loop()
+        future = _pending[short_code] = loop.create_future()
+        if len(_pending) >= MAX_BATCH_SIZE:
+            if _flush_handle is not None:
+                _flush_handle.cancel()
+            _start_flush()
+        elif _flush_handle is None:
+            _flush_handle = loop.call_later(BATCH_WINDOW_SECONDS, _start_flush)
+
+    # Shielded so one cancelled request does not fail the others waiting on it
+    return await asyncio.shield(future)
+
+
+def _start_flush() -> None:
+    """Hand the pending batch to a flush task and start collecting a new one."""
+    global _pending, _flush_handle
+    batch, _pending = _pending, {}
+    _flush_handle = None
+    task = asyncio.create_task(_flush(batch))
+    # Keep a reference until done so the task is not garbage collected
+    _flush_tasks.add(task)
+    task.add_done_callback(_flush_tasks.discard)
+
+
+async def _flush(batch: Dict[str, asyncio.Future]) -> None:
+    """Resolve every future in the batch with one query."""
+    try:
+        if db.SessionLocal is None:
+            raise RuntimeError("Database engine not initialised")
+        async with db.SessionLocal() as session:
+            result = await session.execute(
+                _lookup_stmt, {"short_codes": list(batch)}
+            )
+            rows = {row.short_code: row for row in result}
+
+        for short_code, future in batch.items():
+            if not future.done():
+                future.set_result(rows.get(short_code))
+    except Exception as exc:
+        for future in batch.values():
+            if not future.done():
+                future.set_exception(exc)
+                # Mark it retrieved, as every waiter may already be cancelled
+                future.exception()
+    finally:
+        # Cancelled mid-query (e.g. at shutdown) - do not leave waiters hanging
+        for future in batch.values():
+            future.cancel()
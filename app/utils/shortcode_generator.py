@@ -1,8 +1,29 @@
+import asyncio
+import os
 import secrets
+from typing import Dict, Tuple
 
 from redis.asyncio import Redis
 
 BASE62_ALPHABET = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+_ALPHABET_BYTES = BASE62_ALPHABET.encode("ascii")
+
+# All 62**2 two-digit strings, so six-digit values encode with three lookups
+_DIGIT_PAIRS = tuple(a + b for a in BASE62_ALPHABET for b in BASE62_ALPHABET)
+_PAIR_BASE = 62**2
+_PAIRS_LIMIT = 62**6
+
+# Number of counter values reserved from Redis per round trip; larger blocks mean
+# fewer round trips but more values skipped when a worker restarts
+ID_BLOCK_SIZE = int(os.getenv("SHORTCODE_BLOCK_SIZE", 1024))
+if ID_BLOCK_SIZE < 1:
+    raise ValueError(
+        f"SHORTCODE_BLOCK_SIZE must be a positive integer, got {ID_BLOCK_SIZE}"
+    )
+
+# Per-counter range of reserved values: counter_key -> (next, end) with `end` inclusive
+_id_lock = asyncio.Lock()
+_id_ranges: Dict[str, Tuple[int, int]] = {}
 
 
 async def init_counter(redis_client: Redis, counter_key: str) -> None:
@@ -16,11 +37,11 @@ async def init_counter(redis_client: Redis, counter_key: str) -> None:
     Returns:
         None
     """
-    exists = await redis_client.exists(counter_key)
-    if not exists:
-        # e.g. somewhere between 1B and 10B
-        start = secrets.randbelow(9_000_000_000) + 1_000_000_000
-        await redis_client.set(counter_key, start)
+    # e.g. somewhere between 1B and 10B
+    start = secrets.randbelow(9_000_000_000) + 1_000_000_000
+    # NX makes check-and-set a single atomic round trip, so workers starting
+    # together cannot overwrite each other's (or a live) counter
+    await redis_client.set(counter_key, start, nx=True)
 
 
 def _encode_base62(num: int, length: int = 7) -> str:
@@ -34,28 +55,63 @@ def _encode_base62(num: int, length: int = 7) -> str:
     Returns:
         str: The base62-encoded string representation of the number, left-padded to the desired length.
     """
-    if num == 0:
-        return BASE62_ALPHABET[0] * length
+    # Counter values below 62**6 (~56.8B) fit in six digits: three table lookups
+    if 0 <= num < _PAIRS_LIMIT and length >= 6:
+        high, low = divmod(num, _PAIR_BASE)
+        high, mid = divmod(high, _PAIR_BASE)
+        encoded = _DIGIT_PAIRS[high] + _DIGIT_PAIRS[mid] + _DIGIT_PAIRS[low]
+        return encoded.rjust(length, BASE62_ALPHABET[0])
 
-    chars = []
+    # Otherwise fill a zero-padded buffer of exactly `length` right-to-left
+    out = bytearray(_ALPHABET_BYTES[:1] * length)
+    i = length
+    while num > 0 and i:
+        num, rem = divmod(num, 62)
+        i -= 1
+        out[i] = _ALPHABET_BYTES[rem]
+    # Values longer than `length` grow the buffer at the front
     while num > 0:
         num, rem = divmod(num, 62)
-        chars.append(BASE62_ALPHABET[rem])
-    encoded = "".join(reversed(chars))
-    return encoded.zfill(length)
+        out.insert(0, _ALPHABET_BYTES[rem])
+    return out.decode("ascii")
+
+
+async def next_id(redis_client: Redis, counter_key: str) -> int:
+    """
+    Return the next unique counter value, reserving them from Redis in blocks.
+
+    Values are handed out from a locally reserved range and a new block of
+    ID_BLOCK_SIZE values is claimed with a single INCRBY once it is used up,
+    so only one in every ID_BLOCK_SIZE calls waits on Redis. Values stay
+    increasing within a worker and unique across workers.
+
+    Args:
+        redis_client (Redis): Redis client holding the counter.
+        counter_key (str): Key of the Redis counter.
+
+    Returns:
+        int: The next unused counter value.
+    """
+    async with _id_lock:
+        start, end = _id_ranges.get(counter_key, (1, 0))
+        if start > end:
+            end = await redis_client.incrby(counter_key, ID_BLOCK_SIZE)
+            start = end - ID_BLOCK_SIZE + 1
+        _id_ranges[counter_key] = (start + 1, end)
+        return start
 
 
 async def generate_shortcode(
     redis_client: Redis, incr_key: str, length: int = 7
 ) -> str:
     """
-    Generate a unique shortcode by incrementing a Redis counter and encoding the value in base62.
+    Generate a unique shortcode from the Redis counter and encode the value in base62.
 
     Args:
         length (int, optional): The desired length of the resulting shortcode. Defaults to 7.
 
     Returns:
-        str: A base62-encoded string representation of the incremented counter.
+        str: A base62-encoded string representation of the next counter value.
     """
-    value = await redis_client.incr(incr_key)
+    value = await next_id(redis_client, incr_key)
     return _encode_base62(value, length=length)
@@ -1,6 +1,8 @@
+import asyncio
 from contextlib import asynccontextmanager
 
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from loguru import logger
 
 from app.utils import shortcode_generator
@@ -14,19 +16,24 @@ async def lifespan(app: FastAPI):
     logger.info("Connecting to Database...")
     await db.init_db_engine()
     await db.create_tables()
+    await db.warm_pool()
     logger.info("Connecting to Database Successful")
     logger.info("Connecting to Redis...")
     await redis.init_redis()
     await shortcode_generator.init_counter( await redis.get_redis(), "url:counter")
     logger.info("Connecting to Redis Successful")
+    invalidation_listener = asyncio.create_task(
+        redis.track_invalidations(urls.CACHE_KEY_PREFIX, urls.invalidate_l1_cache)
+    )
 
     yield
 
     logger.info("Shutting Down Application..")
+    invalidation_listener.cancel()
     await db.engine.dispose()
     await redis.redis_client.close()
 
 
-app = FastAPI(lifespan=lifespan)
+app = FastAPI(lifespan=lifespan, default_response_class=ORJSONResponse)
 
 app.include_router(urls.router)